@@ -1,3 +1,11 @@
 from .matrix import RankingMatrix
-from .preferences import is_prefered, is_best, is_prefered_social, pairwise_preferences, count_votes
-from .aggr_rules import condorcet_rule, copeland_rule, simpson_rule, scoring_rule, plurality_rule
\ No newline at end of file
+from .preferences import is_prefered, is_best, is_prefered_social, pairwise_preferences, pairwise_counts, count_votes
+from .aggr_rules import condorcet_rule, copeland_rule, simpson_rule, scoring_rule, plurality_rule, \
+    smith_rule, schwartz_rule, majority_edges, k_approval_rule, veto_rule, bucklin_rule, \
+    median_rank_rule
+from .tally import Tally
+from .live import LiveTally
+from .chunked import write_profile, open_profile, tally_profile
+from .committee import stv_rule, chamberlin_courant_rule, monroe_rule
+from .distances import kendall_tau_matrix, footrule_matrix, k_medoids
+from .cache import ResultCache
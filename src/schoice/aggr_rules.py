@@ -1,9 +1,9 @@
 from collections.abc import Iterable
-from itertools import combinations
 import warnings
 import numpy as np
-from .preferences import pairwise_preferences, candidate_list_filler, count_votes
-from .matrix import RankingMatrix
+from .preferences import pairwise_preferences, pairwise_counts, candidate_list_filler, count_votes
+from .majority_graph import majority_graph, dominant_components, edge_list
+from .matrix import RankingMatrix, position_histogram
 
 
 def condorcet_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
@@ -34,25 +34,33 @@ def simpson_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
     """
     Minimum amount of voters that vote for candidate 
     """
-    candidate_list, _ = candidate_list_filler(rm_obj, candidate_list)
-    pairwise_size = len(candidate_list)
-    vote_matrix = np.zeros((pairwise_size, pairwise_size))
-    np.fill_diagonal(vote_matrix, rm_obj.voters.sum())
-    for i, j in combinations(range(pairwise_size), r = 2):
-        candidate, other = candidate_list[i], candidate_list[j]
-        # Check how much voters vote for candidate and other in pairwise vote
-        _, votes = count_votes(rm_obj, [candidate, other])
-        vote_matrix[i, j] = votes[0]
-        vote_matrix[j, i] = votes[1]
+    # [i, j] is the amount of votes for candidate i in pairwise vote with j,
+    # diagonal holds total amount of voters
+    candidate_list, vote_matrix = pairwise_counts(rm_obj, candidate_list)
     simpson_score = vote_matrix.min(axis = 1)
     return candidate_list[simpson_score == simpson_score.max()], candidate_list, simpson_score
 
 
+def _subset_histogram(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Internal function, position histogram of candidates in candidate_list,
+    cached histogram of rm_obj is used when all candidates run
+    """
+    candidate_list, indices = candidate_list_filler(rm_obj, candidate_list)
+    if len(indices) == rm_obj.n_candidates:
+        return candidate_list, rm_obj.position_histogram[indices, :]
+    if not isinstance(rm_obj, RankingMatrix):
+        raise ValueError("Positional rules for a subset of candidates need RankingMatrix")
+    # Positions among candidate_list
+    positions = rm_obj.ranking_matrix[indices, :].argsort(axis = 0).argsort(axis = 0)
+    return candidate_list, position_histogram(positions, rm_obj.voters)
+
+
 def scoring_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None, weights: Iterable = None):
     """
     Assign descending score to each place in ranking, calculate sums
     """
-    candidate_list, _ = candidate_list_filler(rm_obj, candidate_list)
+    candidate_list, histogram = _subset_histogram(rm_obj, candidate_list)
 
     if weights is None:
         # Running Borda
@@ -65,11 +73,54 @@ def scoring_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None, weights
                                 of candidate_list: {weights.shape[0]}, {len(candidate_list)}")
         if np.any(np.diff(weights) > 0):
             raise ValueError("Weights array is not increasing")
-    weight_matrix = weights[rm_obj.ranking_matrix.astype(int)]
-    scores = weight_matrix @ rm_obj.voters
+    scores = histogram @ weights
+    return candidate_list[scores == scores.max()], candidate_list, scores
+
+
+def k_approval_rule(rm_obj: RankingMatrix, k: int, candidate_list: Iterable = None):
+    """
+    Each voter approves candidates in top k positions, the most approved candidate wins
+    """
+    candidate_list, histogram = _subset_histogram(rm_obj, candidate_list)
+    if not 1 <= k <= len(candidate_list):
+        raise ValueError(f"k should be between 1 and {len(candidate_list)}, received {k}")
+    scores = histogram[:, :k].sum(axis = 1)
     return candidate_list[scores == scores.max()], candidate_list, scores
 
 
+def veto_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Each voter vetoes candidate in the last position, candidate with the fewest vetoes wins
+    """
+    candidate_list, histogram = _subset_histogram(rm_obj, candidate_list)
+    vetoes = histogram[:, -1]
+    return candidate_list[vetoes == vetoes.min()], candidate_list, vetoes
+
+
+def bucklin_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Counts voters that rank candidates in top d positions for d = 1, 2, ...
+    until some candidate gets the majority, the candidate with the most votes at that depth wins
+    """
+    candidate_list, histogram = _subset_histogram(rm_obj, candidate_list)
+    cumulative = histogram.cumsum(axis = 1)
+    # Somebody gets all voters at the last depth, so majority is always reached
+    depth = np.argmax((cumulative > rm_obj.total_voters / 2).any(axis = 0))
+    scores = cumulative[:, depth]
+    return int(depth) + 1, candidate_list[scores == scores.max()], candidate_list, scores
+
+
+def median_rank_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Median position of candidate: the best position p such that at least half of voters
+    rank candidate in position p or higher, candidate with the best median position wins
+    """
+    candidate_list, histogram = _subset_histogram(rm_obj, candidate_list)
+    cumulative = histogram.cumsum(axis = 1)
+    medians = np.argmax(cumulative >= rm_obj.total_voters / 2, axis = 1)
+    return candidate_list[medians == medians.min()], candidate_list, medians
+
+
 def plurality_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None, runoff: bool = False):
     """
     Calculates winners in plurality rule with runoff
@@ -121,6 +172,32 @@ def plurality_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None, runof
     return (tour, still_running, still_running, votes)
 
 
-# Would be interesting to implement with graphx or ??
-def _plot_condorcet_graph(self):
-    raise NotImplementedError("This functionality is not implemented yet")
+def smith_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Smith set (top cycle): smallest set of candidates that beat every candidate
+    outside of it, dominant component of the weak majority graph
+    """
+    candidates, preferences = pairwise_preferences(rm_obj, candidate_list)
+    smith_set = dominant_components(majority_graph(preferences, weak = True))
+    return candidates[smith_set], candidates, preferences
+
+
+def schwartz_rule(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Schwartz set: union of minimal sets of candidates not beaten by anyone outside,
+    dominant components of the majority graph
+    """
+    candidates, preferences = pairwise_preferences(rm_obj, candidate_list)
+    schwartz_set = dominant_components(majority_graph(preferences))
+    return candidates[schwartz_set], candidates, preferences
+
+
+def majority_edges(rm_obj: RankingMatrix, candidate_list: Iterable = None, weak: bool = False):
+    """
+    Exports the majority graph for visualization: (winner, loser) pairs of candidates
+    and the majority margins on those edges
+    """
+    candidates, counts = pairwise_counts(rm_obj, candidate_list)
+    margins = counts - counts.T
+    edges = edge_list(majority_graph(np.sign(margins), weak = weak))
+    return candidates[edges], margins[edges[:, 0], edges[:, 1]]
@@ -0,0 +1,216 @@
+from collections import OrderedDict
+import contextlib
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import numpy as np
+from .preferences import candidate_list_filler
+
+
+def _canonical(value):
+    """
+    Internal function, converts parameters to a hashable representation,
+    arrays are converted completely (repr of np.array is truncated)
+    """
+    if isinstance(value, (np.ndarray, list, tuple)):
+        return ("array", repr(np.asarray(value).tolist()))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((key, _canonical(item)) for key, item in value.items())))
+    return repr(value)
+
+
+def _bind(rule, args: tuple, kwargs: dict):
+    """
+    Internal function, binds call arguments to the parameters of rule,
+    functools.partial is unwrapped into the function and its arguments
+    """
+    while isinstance(rule, functools.partial):
+        args = rule.args + tuple(args)
+        kwargs = {**rule.keywords, **kwargs}
+        rule = rule.func
+    bound = inspect.signature(rule).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return rule, bound.arguments
+
+
+class ResultCache:
+    """
+    LRU cache of rule results keyed by (profile fingerprint, rule, parameters,
+    candidate subset), optionally persisted on disk
+
+    In memory results are keyed by the rule object itself. On disk rules are identified
+    by module and qualified name, so results of lambdas and functions defined inside
+    other functions are kept only in memory
+
+    Attributes
+    ----------
+    maxsize: int
+        Maximum amount of results kept in memory and on disk
+    path: str
+        Directory for results on disk, None keeps results only in memory
+    hits: int
+        Amount of calls answered from cache
+    misses: int
+        Amount of calls that ran the rule
+    """
+    def __init__(self, maxsize: int = 128, path: str = None):
+        """
+        Parameters
+        ----------
+        maxsize: int
+            Maximum amount of results kept in memory and on disk
+        path: str
+            Directory for results on disk, created if it does not exist
+        """
+        if maxsize < 1:
+            raise ValueError(f"Expected positive maxsize, received {maxsize}")
+        self.maxsize = maxsize
+        self.path = path
+        if path is not None:
+            os.makedirs(path, exist_ok = True)
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+
+    def key(self, rule, *args, **kwargs):
+        """
+        Builds a key for the call rule(*args, **kwargs): the rule itself and a digest of
+        profile fingerprint, parameters and candidate subset (taken after removing duplicates)
+        """
+        func, arguments = _bind(rule, args, kwargs)
+        names = list(arguments)
+        # First parameter of every rule is the profile
+        rm_obj = arguments[names[0]]
+        candidate_list = arguments.get("candidate_list")
+        if candidate_list is not None:
+            candidate_list, _ = candidate_list_filler(rm_obj, candidate_list)
+            candidate_list = tuple(candidate_list.tolist())
+        params = tuple((name, _canonical(arguments[name])) for name in names[1:]
+                       if name != "candidate_list")
+        digest = hashlib.sha256(
+            repr((rm_obj.fingerprint(), params, candidate_list)).encode()
+        ).hexdigest()
+        return func, digest
+
+
+    def __call__(self, rule, *args, **kwargs):
+        """
+        Returns result of rule(*args, **kwargs) from cache, runs the rule on a miss
+        """
+        key = self.key(rule, *args, **kwargs)
+        found, result = self._get(key)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+            result = rule(*args, **kwargs)
+            self._put(key, result)
+        # Callers get copies, so cached arrays can not be modified
+        return copy.deepcopy(result)
+
+
+    def wrap(self, rule):
+        """
+        Returns cached version of rule with the same signature
+        """
+        @functools.wraps(rule)
+        def cached_rule(*args, **kwargs):
+            return self(rule, *args, **kwargs)
+        return cached_rule
+
+
+    def clear(self):
+        """
+        Removes all results from memory and disk
+        """
+        self._memory.clear()
+        for file_name in self._disk_files():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.path, file_name))
+
+
+    def _disk_path(self, key: tuple):
+        """
+        File for the key, None if results are kept only in memory: lambdas and
+        functions defined inside other functions can not be told apart across runs
+        """
+        func, digest = key
+        if self.path is None:
+            return None
+        name = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', '<unknown>')}"
+        if "<" in name:
+            return None
+        file_name = hashlib.sha256(f"{name}:{digest}".encode()).hexdigest()
+        return os.path.join(self.path, f"{file_name}.pkl")
+
+
+    def _get(self, key: tuple):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return True, self._memory[key]
+        file_path = self._disk_path(key)
+        if file_path is None:
+            return False, None
+        # Other processes may evict or replace the file at any moment
+        try:
+            with open(file_path, "rb") as cache_file:
+                result = pickle.load(cache_file)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # Broken file (e.g. left by a crashed job) is a miss
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(file_path)
+            return False, None
+        # Touch the file, disk eviction uses modification time
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(file_path)
+        self._remember(key, result)
+        return True, result
+
+
+    def _put(self, key: tuple, result):
+        self._remember(key, result)
+        file_path = self._disk_path(key)
+        if file_path is None:
+            return
+        # Write to a temporary file and replace, so readers never see a partial result
+        temp_file = tempfile.NamedTemporaryFile(dir = self.path, suffix = ".tmp", delete = False)
+        try:
+            with temp_file:
+                pickle.dump(result, temp_file)
+            os.replace(temp_file.name, file_path)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+        self._evict_disk()
+
+
+    def _evict_disk(self):
+        # Files removed by other processes meanwhile are skipped
+        modified = []
+        for file_name in self._disk_files():
+            with contextlib.suppress(FileNotFoundError):
+                modified.append((os.path.getmtime(os.path.join(self.path, file_name)), file_name))
+        modified.sort()
+        for _, file_name in modified[:len(modified) - self.maxsize]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.path, file_name))
+
+
+    def _remember(self, key: tuple, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last = False)
+
+
+    def _disk_files(self):
+        if self.path is None:
+            return []
+        return [name for name in os.listdir(self.path) if name.endswith(".pkl")]
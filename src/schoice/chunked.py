@@ -0,0 +1,89 @@
+from collections.abc import Iterable
+import os
+import numpy as np
+from .tally import Tally
+
+# Profile on disk is a directory with candidates and raw row-major arrays,
+# raw files can be appended chunk by chunk and memmapped without knowing the size
+CANDIDATES_FILE = "candidates.npy"
+POSITIONS_FILE = "positions.dat"
+VOTERS_FILE = "voters.dat"
+POSITIONS_DTYPE = np.int32
+VOTERS_DTYPE = np.int64
+
+
+def write_profile(path: str, candidates: Iterable, chunks: Iterable):
+    """
+    Writes a profile to disk chunk by chunk, so it never has to fit in memory
+
+    Parameters
+    ----------
+    path: str
+        Directory for the profile, created if it does not exist
+    candidates: Iterable
+        One dimensional Iterable with candidates that appear on ballots
+    chunks: Iterable
+        Iterable of (ranking, voters) pairs in the same format as RankingMatrix.add
+    """
+    # Tally is used only to validate and convert rankings to positions
+    converter = Tally(candidates)
+    os.makedirs(path, exist_ok = True)
+    np.save(os.path.join(path, CANDIDATES_FILE), converter.candidates)
+    n_groups = 0
+    with open(os.path.join(path, POSITIONS_FILE), "wb") as positions_file, \
+         open(os.path.join(path, VOTERS_FILE), "wb") as voters_file:
+        for ranking, voters in chunks:
+            positions = converter.positions(ranking)
+            voters = np.array(voters).reshape(-1)
+            if positions.shape[1] != voters.shape[0]:
+                raise ValueError(f"Expected voters and rankings dimensions to coincide, but received: \
+                                 ranking: {positions.shape[1]}, \n \
+                                 voters: {voters.shape[0]})")
+            # Rows correspond to voter groups on disk
+            positions.T.astype(POSITIONS_DTYPE).tofile(positions_file)
+            voters.astype(VOTERS_DTYPE).tofile(voters_file)
+            n_groups += voters.shape[0]
+    return n_groups
+
+
+def open_profile(path: str):
+    """
+    Opens a profile written by write_profile as read-only memmaps
+
+    Returns candidates, positions (rows correspond to voter groups) and voters
+    """
+    candidates = np.load(os.path.join(path, CANDIDATES_FILE))
+    if os.path.getsize(os.path.join(path, VOTERS_FILE)) == 0:
+        # Empty files can not be memmapped
+        return (candidates, np.empty((0, candidates.shape[0]), dtype = POSITIONS_DTYPE),
+                np.empty(0, dtype = VOTERS_DTYPE))
+    voters = np.memmap(os.path.join(path, VOTERS_FILE), dtype = VOTERS_DTYPE, mode = "r")
+    positions = np.memmap(os.path.join(path, POSITIONS_FILE), dtype = POSITIONS_DTYPE,
+                          mode = "r", shape = (voters.shape[0], candidates.shape[0]))
+    return candidates, positions, voters
+
+
+def iter_profile_chunks(path: str, chunk_size: int = 100_000):
+    """
+    Yields (ranking_matrix, voters) chunks of at most chunk_size voter groups,
+    where [i, j] of ranking_matrix is a position of candidate i for voter group j
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Expected positive chunk_size, received {chunk_size}")
+    _, positions, voters = open_profile(path)
+    for start in range(0, voters.shape[0], chunk_size):
+        stop = start + chunk_size
+        # Copy only the current chunk into memory
+        yield np.array(positions[start:stop]).T, np.array(voters[start:stop])
+
+
+def tally_profile(path: str, chunk_size: int = 100_000):
+    """
+    Accumulates first preferences, position histogram and pairwise counts of an on-disk
+    profile, peak memory is O(m^2 + m * chunk_size), rules from tally run on the result
+    """
+    candidates, _, _ = open_profile(path)
+    tally = Tally(candidates)
+    for ranking_matrix, voters in iter_profile_chunks(path, chunk_size):
+        tally.update_positions(ranking_matrix, voters)
+    return tally
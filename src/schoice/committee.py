@@ -0,0 +1,175 @@
+from collections.abc import Iterable
+import heapq
+import numpy as np
+from .preferences import candidate_list_filler
+from .matrix import RankingMatrix
+
+
+def _committee_positions(rm_obj: RankingMatrix, candidate_list: Iterable, k: int):
+    """
+    Internal function, returns candidates and positions of candidates among candidate_list,
+    [i, j] is a position of candidate i for voter group j
+    """
+    candidate_list, indices = candidate_list_filler(rm_obj, candidate_list)
+    if not 1 <= k <= len(candidate_list):
+        raise ValueError(f"Committee size should be between 1 and {len(candidate_list)}, \
+                         received {k}")
+    positions = rm_obj.ranking_matrix[indices, :]
+    if len(indices) != rm_obj.n_candidates:
+        # Re-rank, positions should not have gaps left by candidates outside the list
+        positions = positions.argsort(axis = 0).argsort(axis = 0)
+    return candidate_list, positions.astype(np.int32)
+
+
+def _satisfaction_weights(n_candidates: int, weights: Iterable = None):
+    """
+    Internal function, converts weights as in scoring_rule to scores indexed by position
+    """
+    if weights is None:
+        # Borda satisfaction
+        return np.arange(0, n_candidates)[::-1].astype(float)
+    weights = np.array(weights, dtype = float)[::-1]
+    if weights.shape[0] != n_candidates:
+        raise ValueError(f"Shape of weights does not correspond to the shape \
+                            of candidate_list: {weights.shape[0]}, {n_candidates}")
+    if np.any(np.diff(weights) > 0):
+        raise ValueError("Weights array is not increasing")
+    return weights
+
+
+def stv_rule(rm_obj: RankingMatrix, k: int, candidate_list: Iterable = None):
+    """
+    Single transferable vote with Droop quota and fractional surplus transfers
+
+    Every voter group holds a weight and a pointer to its best continuing candidate,
+    when a candidate is elected or eliminated only groups that currently support
+    them are moved, candidate totals are updated by the moved weight
+
+    Returns: committee in order of election, candidates, votes of candidates in the
+    last round
+    """
+    candidate_list, positions = _committee_positions(rm_obj, candidate_list, k)
+    n_candidates = len(candidate_list)
+    # order[j, p] is a candidate in position p for voter group j
+    order = positions.argsort(axis = 0).T
+    group_weight = rm_obj.voters.astype(float)
+    pointer = np.zeros(order.shape[0], dtype = int)
+    supported = order[:, 0].copy()
+    votes = np.bincount(supported, weights = group_weight, minlength = n_candidates)
+    quota = np.floor(group_weight.sum() / (k + 1)) + 1
+    continuing = np.ones(n_candidates, dtype = bool)
+    committee = []
+
+    def transfer(candidate, factor):
+        # Move groups of candidate to their next continuing preference
+        moved = np.flatnonzero(supported == candidate)
+        group_weight[moved] *= factor
+        while moved.size > 0:
+            pointer[moved] += 1
+            exhausted = pointer[moved] >= n_candidates
+            # Exhausted ballots leave the count
+            group_weight[moved[exhausted]] = 0
+            supported[moved[exhausted]] = -1
+            moved = moved[~exhausted]
+            supported[moved] = order[moved, pointer[moved]]
+            landed = continuing[supported[moved]]
+            np.add.at(votes, supported[moved[landed]], group_weight[moved[landed]])
+            moved = moved[~landed]
+        votes[candidate] = quota if candidate in committee else 0
+
+    while len(committee) < k:
+        running = np.flatnonzero(continuing)
+        if len(committee) + running.shape[0] == k:
+            # Remaining candidates fill the committee
+            committee.extend(running[np.argsort(-votes[running], kind = "stable")].tolist())
+            break
+        best = running[np.argmax(votes[running])]
+        if votes[best] >= quota:
+            continuing[best] = False
+            committee.append(best)
+            transfer(best, (votes[best] - quota) / votes[best])
+        else:
+            worst = running[np.argmin(votes[running])]
+            continuing[worst] = False
+            transfer(worst, 1.0)
+    return candidate_list[np.array(committee)], candidate_list, votes
+
+
+def chamberlin_courant_rule(rm_obj: RankingMatrix, k: int, candidate_list: Iterable = None,
+                            weights: Iterable = None):
+    """
+    Greedy approximation of Chamberlin-Courant: every voter is represented by their best
+    committee member, candidates are added by the highest marginal gain in satisfaction
+
+    Satisfaction is positional (Borda by default, weights as in scoring_rule).
+    Marginal gains only decrease as the committee grows, so lazy greedy keeps stale
+    gains in a priority queue and recomputes only the top one
+
+    Returns: committee in order of selection, candidates, marginal gains of committee members
+    """
+    candidate_list, positions = _committee_positions(rm_obj, candidate_list, k)
+    scores = _satisfaction_weights(len(candidate_list), weights)
+    voters = rm_obj.voters.astype(float)
+    represented = np.zeros(voters.shape[0])
+
+    def gain(candidate):
+        return voters @ np.maximum(scores[positions[candidate]] - represented, 0)
+
+    # Heap of (-gain, candidate, committee size when gain was computed)
+    heap = [(-gain(candidate), candidate, 0) for candidate in range(len(candidate_list))]
+    heapq.heapify(heap)
+    committee, gains = [], []
+    while len(committee) < k:
+        neg_gain, candidate, computed_at = heapq.heappop(heap)
+        if computed_at == len(committee):
+            committee.append(candidate)
+            gains.append(-neg_gain)
+            represented = np.maximum(represented, scores[positions[candidate]])
+        else:
+            heapq.heappush(heap, (-gain(candidate), candidate, len(committee)))
+    return candidate_list[np.array(committee)], candidate_list, np.array(gains)
+
+
+def monroe_rule(rm_obj: RankingMatrix, k: int, candidate_list: Iterable = None,
+                weights: Iterable = None):
+    """
+    Greedy approximation of Monroe: every committee member represents n / k voters,
+    candidates are added together with the unassigned voters that rank them highest
+
+    Voter groups are split fractionally at the capacity boundary, so groups are never
+    expanded. Gain of a candidate is computed from unassigned voters per position
+    and only decreases, so lazy greedy is used as in chamberlin_courant_rule
+
+    Returns: committee in order of selection, candidates, satisfaction of voters
+    represented by committee members
+    """
+    candidate_list, positions = _committee_positions(rm_obj, candidate_list, k)
+    n_candidates = len(candidate_list)
+    scores = _satisfaction_weights(n_candidates, weights)
+    unassigned = rm_obj.voters.astype(float)
+    capacity = unassigned.sum() / k
+
+    def by_position(candidate):
+        # Unassigned voters that put candidate in every position
+        return np.bincount(positions[candidate], weights = unassigned, minlength = n_candidates)
+
+    def gain(candidate):
+        taken = np.diff(np.minimum(np.cumsum(by_position(candidate)), capacity), prepend = 0)
+        return taken @ scores
+
+    heap = [(-gain(candidate), candidate, 0) for candidate in range(n_candidates)]
+    heapq.heapify(heap)
+    committee, gains = [], []
+    while len(committee) < k:
+        neg_gain, candidate, computed_at = heapq.heappop(heap)
+        if computed_at != len(committee):
+            heapq.heappush(heap, (-gain(candidate), candidate, len(committee)))
+            continue
+        committee.append(candidate)
+        gains.append(-neg_gain)
+        # Assign voters from the best positions until capacity is reached
+        available = by_position(candidate)
+        taken = np.diff(np.minimum(np.cumsum(available), capacity), prepend = 0)
+        share = np.divide(taken, available, out = np.zeros(n_candidates), where = available > 0)
+        unassigned *= 1 - share[positions[candidate]]
+    return candidate_list[np.array(committee)], candidate_list, np.array(gains)
@@ -0,0 +1,213 @@
+import numpy as np
+from .matrix import RankingMatrix
+
+METRICS = ("kendall", "footrule")
+
+
+def _group_positions(rm_obj: RankingMatrix):
+    """
+    Internal function, returns positions and orders of voter groups,
+    positions[j, i] is a position of candidate i for group j,
+    orders[j, p] is a candidate in position p for group j
+    """
+    positions = rm_obj.ranking_matrix.T.astype(np.int64)
+    return positions, positions.argsort(axis = 1)
+
+
+def _count_inversions(permutations: np.array):
+    """
+    Counts inversions in every row of permutations with a Fenwick tree,
+    O(m log m) per row, vectorized over rows
+    """
+    n_rows, n_positions = permutations.shape
+    width = n_positions + 2
+    # Trees of all rows are stored flat, last column of every tree collects
+    # updates that run past the end
+    offsets = np.arange(n_rows) * width
+    tree = np.zeros(n_rows * width, dtype = np.int32)
+    inversions = np.zeros(n_rows, dtype = np.int64)
+    n_steps = n_positions.bit_length() + 1
+    for t in range(n_positions):
+        value = permutations[:, t] + 1
+        # Seen values that are not greater than value
+        index = value.copy()
+        seen = np.zeros(n_rows, dtype = np.int64)
+        for _ in range(n_steps):
+            seen += tree[offsets + index]
+            index -= index & -index
+        inversions += t - seen
+        index = value
+        for _ in range(n_steps):
+            tree[offsets + index] += 1
+            index = np.minimum(index + (index & -index), n_positions + 1)
+    return inversions
+
+
+def _distance_block(positions: np.array, orders: np.array, rows: np.array, cols: np.array,
+                    metric: str):
+    """
+    Internal function, distances between groups in rows and groups in cols
+    """
+    if metric == "kendall":
+        # Positions of row rankings in order of column rankings, inversions are discordant pairs
+        permutations = positions[rows][:, orders[cols]]
+        return _count_inversions(
+            permutations.reshape(-1, positions.shape[1])
+        ).reshape(len(rows), len(cols))
+    return np.abs(positions[rows][:, None, :] - positions[cols][None, :, :]).sum(axis = 2)
+
+
+def _tile_steps(n_cols: int, n_candidates: int, max_block: int):
+    """
+    Internal function, amounts of rows and cols per tile to hold at most max_block positions
+    (at least one pair of groups per tile)
+    """
+    col_step = max(1, min(n_cols, max_block // n_candidates))
+    row_step = max(1, max_block // (col_step * n_candidates))
+    return row_step, col_step
+
+
+def _tiles(n_rows: int, n_cols: int, n_candidates: int, max_block: int):
+    """
+    Internal function, splits rows x cols into tiles that hold at most max_block positions
+    """
+    row_step, col_step = _tile_steps(n_cols, n_candidates, max_block)
+    for row_start in range(0, n_rows, row_step):
+        for col_start in range(0, n_cols, col_step):
+            yield (slice(row_start, min(row_start + row_step, n_rows)),
+                   slice(col_start, min(col_start + col_step, n_cols)))
+
+
+def _check_metric(metric: str):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric}, expected one of {METRICS}")
+
+
+def distance_matrix(rm_obj: RankingMatrix, metric: str = "kendall", max_block: int = 2 ** 18):
+    """
+    Computes distances between all voter groups of RankingMatrix,
+    distances are unweighted: amounts of voters in groups are not taken into account
+
+    Parameters
+    ----------
+    rm_obj: RankingMatrix
+        Ranking matrix with voter groups
+    metric: str
+        "kendall" for Kendall tau distance (number of discordant pairs), computed by
+        inversion counting in O(m log m) per pair, or "footrule" for Spearman footrule
+        distance (sum of absolute differences of positions)
+    max_block: int
+        Maximum amount of positions held in memory at once, a tile holds
+        at least one pair of groups
+    """
+    _check_metric(metric)
+    positions, orders = _group_positions(rm_obj)
+    n_groups, n_candidates = positions.shape
+    distances = np.zeros((n_groups, n_groups), dtype = np.int64)
+    row_step, col_step = _tile_steps(n_groups, n_candidates, max_block)
+    # Matrix is symmetric, compute tiles of the upper part
+    for row_start in range(0, n_groups, row_step):
+        rows = np.arange(row_start, min(row_start + row_step, n_groups))
+        for col_start in range(row_start, n_groups, col_step):
+            cols = np.arange(col_start, min(col_start + col_step, n_groups))
+            block = _distance_block(positions, orders, rows, cols, metric)
+            distances[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1] = block
+            distances[cols[0]:cols[-1] + 1, rows[0]:rows[-1] + 1] = block.T
+    return distances
+
+
+def kendall_tau_matrix(rm_obj: RankingMatrix, max_block: int = 2 ** 18):
+    """
+    Unweighted Kendall tau distances between voter groups
+    """
+    return distance_matrix(rm_obj, "kendall", max_block)
+
+
+def footrule_matrix(rm_obj: RankingMatrix, max_block: int = 2 ** 18):
+    """
+    Unweighted Spearman footrule distances between voter groups
+    """
+    return distance_matrix(rm_obj, "footrule", max_block)
+
+
+def _distances_to(positions: np.array, orders: np.array, rows: np.array, cols: np.array,
+                  metric: str, max_block: int):
+    """
+    Internal function, distances from rows to a small set of cols computed by tiles
+    """
+    distances = np.empty((len(rows), len(cols)), dtype = np.int64)
+    for row_tile, col_tile in _tiles(len(rows), len(cols), positions.shape[1], max_block):
+        distances[row_tile, col_tile] = _distance_block(positions, orders, rows[row_tile],
+                                                        cols[col_tile], metric)
+    return distances
+
+
+def _weighted_distance_sums(positions: np.array, orders: np.array, rows: np.array,
+                            weights: np.array, cols: np.array, metric: str, max_block: int):
+    """
+    Internal function, weighted sums of distances from rows to every col,
+    accumulated by tiles
+    """
+    sums = np.zeros(len(cols))
+    for row_tile, col_tile in _tiles(len(rows), len(cols), positions.shape[1], max_block):
+        sums[col_tile] += weights[row_tile] @ _distance_block(
+            positions, orders, rows[row_tile], cols[col_tile], metric
+        )
+    return sums
+
+
+def k_medoids(rm_obj: RankingMatrix, k: int, metric: str = "kendall", max_iter: int = 100,
+              seed: int = None, max_block: int = 2 ** 18):
+    """
+    Clusters voter groups with k-medoids, groups are weighted by amount of voters,
+    so duplicate rankings are never expanded
+
+    Medoids are initialized by weighted k-medoids++ and updated by alternating between
+    assignment to the nearest medoid and choosing the member with the smallest
+    weighted distance to the rest of its cluster. Groups without voters become medoids
+    only when k exceeds the amount of distinct weighted groups. Distances are computed
+    by blocks, full distance matrix is not stored
+
+    Returns: indices of medoid groups, cluster label of every group,
+    weighted sum of distances to the nearest medoid
+    """
+    _check_metric(metric)
+    positions, orders = _group_positions(rm_obj)
+    n_groups = positions.shape[0]
+    if not 1 <= k <= n_groups:
+        raise ValueError(f"Amount of clusters should be between 1 and {n_groups}, received {k}")
+    weights = rm_obj.voters.astype(float)
+    groups = np.arange(n_groups)
+    rng = np.random.default_rng(seed)
+
+    def distances_to(medoids):
+        return _distances_to(positions, orders, groups, np.array(medoids), metric, max_block)
+
+    def draw(probabilities, chosen):
+        if probabilities.sum() == 0:
+            # Only groups without voters or already chosen groups are left, draw uniformly
+            probabilities = np.ones(n_groups)
+            probabilities[chosen] = 0
+        return rng.choice(n_groups, p = probabilities / probabilities.sum())
+
+    # Weighted k-medoids++: the next medoid is drawn proportionally to voters * distance
+    medoids = [draw(weights, [])]
+    nearest = distances_to(medoids)[:, 0]
+    while len(medoids) < k:
+        medoids.append(draw(weights * nearest, medoids))
+        nearest = np.minimum(nearest, distances_to(medoids[-1:])[:, 0])
+
+    for _ in range(max_iter):
+        labels = distances_to(medoids).argmin(axis = 1)
+        new_medoids = []
+        for cluster in range(k):
+            members = np.flatnonzero(labels == cluster)
+            cost = _weighted_distance_sums(positions, orders, members, weights[members],
+                                           members, metric, max_block)
+            new_medoids.append(members[np.argmin(cost)])
+        if new_medoids == medoids:
+            break
+        medoids = new_medoids
+    distances = distances_to(medoids)
+    labels = distances.argmin(axis = 1)
+    return np.array(medoids), labels, weights @ distances.min(axis = 1)
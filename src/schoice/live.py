@@ -0,0 +1,212 @@
+from collections.abc import Iterable
+import asyncio
+import time
+import warnings
+import numpy as np
+from .tally import Tally, TALLY_RULES
+
+
+class LiveTally:
+    """
+    Asyncio service that ingests ballot batches from concurrent producers into running
+    tallies and publishes winners of the configured rules at a bounded refresh rate
+
+    Attributes
+    ----------
+    tally: Tally
+        Running first preference, positional and pairwise tallies
+    rules: dict
+        Mapping from rule name to a function that takes Tally
+    refresh_interval: float
+        Minimum amount of seconds between two publications
+    results: dict
+        Latest published results of every rule, a rule that raised holds its exception
+    version: int
+        Number of publications so far
+    """
+    def __init__(self, candidates: Iterable, rules: Iterable = ("plurality", "scoring", "condorcet"),
+                 refresh_interval: float = 1.0, max_pending: int = 0):
+        """
+        Parameters
+        ----------
+        candidates: Iterable
+            One dimensional Iterable with candidates that can appear on ballots
+        rules: Iterable
+            Names of rules from TALLY_RULES or a dict mapping names to functions of Tally
+        refresh_interval: float
+            Minimum amount of seconds between two publications
+        max_pending: int
+            Maximum amount of batches waiting for ingestion, submit waits when it is
+            reached, 0 means no limit
+        """
+        self.tally = Tally(candidates)
+        if isinstance(rules, dict):
+            self.rules = dict(rules)
+        else:
+            unknown = [rule for rule in rules if rule not in TALLY_RULES]
+            if unknown:
+                raise ValueError(f"Unknown rules: {unknown}, available: {list(TALLY_RULES)}")
+            self.rules = {rule: TALLY_RULES[rule] for rule in rules}
+        self.refresh_interval = refresh_interval
+        self.max_pending = max_pending
+        self.results = {}
+        self.version = 0
+        # Asyncio primitives are created in start to bind them to the running loop
+        self._queue = None
+        self._dirty = None
+        self._published = None
+        self._tasks = []
+        self._closed = False
+        self._batches_tallied = 0
+        self._batches_published = 0
+
+
+    async def start(self):
+        """
+        Starts ingestion and publication tasks
+        """
+        if self._tasks:
+            raise RuntimeError("LiveTally is already running")
+        self._queue = asyncio.Queue(maxsize = self.max_pending)
+        self._dirty = asyncio.Event()
+        self._published = asyncio.Condition()
+        self._closed = False
+        self._tasks = [asyncio.ensure_future(self._ingest()),
+                       asyncio.ensure_future(self._publish_loop())]
+
+
+    async def stop(self):
+        """
+        Waits until all submitted batches are tallied, stops the tasks
+        and publishes the final results
+        """
+        if not self._tasks:
+            return
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions = True)
+        self._tasks = []
+        if self._batches_published != self._batches_tallied:
+            await self._publish()
+        # Let consumers of updates finish
+        async with self._published:
+            self._closed = True
+            self._published.notify_all()
+
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+
+    async def submit(self, ranking: Iterable, voters: Iterable):
+        """
+        Submits a batch of rankings, rows correspond to voters as in RankingMatrix.add
+        Batch is validated here, so errors are raised to the producer
+        """
+        if not self._tasks:
+            raise RuntimeError("LiveTally is not running, call start first")
+        positions = self.tally.positions(ranking)
+        try:
+            voters = np.array(voters, dtype = float).reshape(-1)
+        except (TypeError, ValueError) as voters_err:
+            raise ValueError(f"Expected numeric voters, received {voters}") from voters_err
+        if positions.shape[1] != voters.shape[0]:
+            raise ValueError(f"Expected voters and rankings dimensions to coincide, but received: \
+                             ranking: {positions.shape[1]}, \n \
+                             voters: {voters.shape[0]})")
+        await self._queue.put((positions, voters))
+
+
+    def updates(self):
+        """
+        Returns asynchronous generator that yields results after every publication,
+        slow consumers skip intermediate versions and get the latest one.
+        Generator ends after stop, once the final results are yielded
+        """
+        if not self._tasks:
+            raise RuntimeError("LiveTally is not running, call start first")
+        return self._updates(self.version)
+
+
+    async def _updates(self, seen: int):
+        while True:
+            async with self._published:
+                await self._published.wait_for(lambda: self.version != seen or self._closed)
+                if self.version == seen:
+                    return
+                seen = self.version
+                results = self.results
+            yield results
+
+
+    def _compute(self, tally: Tally):
+        """
+        Runs every configured rule on a snapshot of tallies,
+        exception of a failed rule is stored in place of its result
+        """
+        results = {}
+        for name, rule in self.rules.items():
+            try:
+                results[name] = rule(tally)
+            except Exception as rule_err:
+                results[name] = rule_err
+        return results
+
+
+    def _tally_batch(self, positions: np.array, voters: np.array):
+        batch = Tally(self.tally.candidates)
+        batch.update_positions(positions, voters)
+        return batch
+
+
+    async def _ingest(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            positions, voters = await self._queue.get()
+            try:
+                # Batch is tallied in executor, O(m^2 * batch) does not block producers
+                # and publication, merging into running tallies is O(m^2)
+                batch = await loop.run_in_executor(None, self._tally_batch, positions, voters)
+                self.tally.merge(batch)
+                self._batches_tallied += 1
+                self._dirty.set()
+            except Exception as ingest_err:
+                # Skip the batch, stop waits for the rest of the queue
+                warnings.warn(f"Failed to tally batch: {ingest_err!r}")
+            finally:
+                self._queue.task_done()
+
+
+    async def _publish_loop(self):
+        while True:
+            await self._dirty.wait()
+            started = time.monotonic()
+            try:
+                await self._publish()
+            except asyncio.CancelledError:
+                raise
+            except Exception as publish_err:
+                # Keep publishing later batches
+                warnings.warn(f"Failed to publish results: {publish_err!r}")
+            # Bound refresh rate, ingestion keeps running meanwhile
+            await asyncio.sleep(max(0, self.refresh_interval - (time.monotonic() - started)))
+
+
+    async def _publish(self):
+        # Snapshot is O(m^2) and rules run in executor, so ingestion is not blocked
+        self._dirty.clear()
+        batches = self._batches_tallied
+        snapshot = self.tally.copy()
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self._compute, snapshot)
+        async with self._published:
+            self.results = results
+            self.version += 1
+            self._batches_published = batches
+            self._published.notify_all()
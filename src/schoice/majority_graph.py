@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def majority_graph(preferences: np.array, weak: bool = False):
+    """
+    Builds adjacency matrix of the majority graph from pairwise preferences,
+    [i, j] is True if candidate i beats candidate j (beats or ties if weak)
+    """
+    preferences = np.asarray(preferences)
+    adjacency = preferences >= 0 if weak else preferences == 1
+    np.fill_diagonal(adjacency, False)
+    return adjacency
+
+
+def strongly_connected_components(adjacency: np.array):
+    """
+    Iterative Tarjan algorithm on a dense adjacency matrix, O(m^2)
+
+    Returns component label of every node and number of components,
+    labels are in reverse topological order (sink components come first)
+    """
+    n_nodes = adjacency.shape[0]
+    index = [-1] * n_nodes
+    lowlink = [0] * n_nodes
+    on_stack = [False] * n_nodes
+    component = np.full(n_nodes, -1)
+    stack = []
+    counter = 0
+    n_components = 0
+    for root in range(n_nodes):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        # Work stack replaces recursion: node and iterator over its unvisited edges
+        work = [(root, iter(np.flatnonzero(adjacency[root]).tolist()))]
+        while work:
+            node, neighbours = work[-1]
+            for other in neighbours:
+                if index[other] == -1:
+                    index[other] = lowlink[other] = counter
+                    counter += 1
+                    stack.append(other)
+                    on_stack[other] = True
+                    work.append((other, iter(np.flatnonzero(adjacency[other]).tolist())))
+                    break
+                if on_stack[other]:
+                    lowlink[node] = min(lowlink[node], index[other])
+            else:
+                # All edges of node are processed
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = n_components
+                        if member == node:
+                            break
+                    n_components += 1
+    return component, n_components
+
+
+def dominant_components(adjacency: np.array):
+    """
+    Returns boolean mask of nodes in strongly connected components
+    that have no incoming edges from other components
+    """
+    component, n_components = strongly_connected_components(adjacency)
+    rows, cols = np.nonzero(adjacency)
+    between = component[rows] != component[cols]
+    has_incoming = np.zeros(n_components, dtype = bool)
+    has_incoming[component[cols[between]]] = True
+    return ~has_incoming[component]
+
+
+def edge_list(adjacency: np.array):
+    """
+    Exports the graph as an array of (from, to) index pairs
+    """
+    return np.argwhere(adjacency)
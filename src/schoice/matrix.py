@@ -1,4 +1,5 @@
 from collections.abc import Iterable
+import hashlib
 import numpy as np
 
 class RankingMatrix:
@@ -13,6 +14,14 @@ class RankingMatrix:
         One dimensional np.array that contains quantity of voters with given preferences
     candidates: np.array
         One dimensional np.array that contains unique values of ranking table
+    position_histogram: np.array
+        Two dimensional np.array, where [i, p] corresponds to the amount of voters
+        that put candidate i in position p, built on first access
+    pairwise_counts: np.array
+        Two dimensional np.array, where [i, j] corresponds to the amount of voters
+        that prefer candidate i to candidate j, built on first access
+    total_voters: int
+        Total amount of voters
     """
     def __init__(self, ranking: Iterable, voters: Iterable):
         """
@@ -53,6 +62,11 @@ class RankingMatrix:
 
         # Build ranking matrix for further calculations
         self.ranking_matrix = self._build_ranking_matrix(self.ranking, self.candidates_to_ix)
+        # Computed lazily in fingerprint, position_histogram and pairwise_counts
+        self._fingerprint = None
+        self._position_histogram = None
+        self._pairwise_counts = None
+        self._total_voters = None
 
 
     def _dimension_checker(self, ranking, voters):
@@ -147,6 +161,56 @@ class RankingMatrix:
         self.ranking, self.voters = self._shrink_duplicates(self.ranking, self.voters)
         self.n_voters = self.voters.shape[0]
         self.ranking_matrix = self._build_ranking_matrix(self.ranking, self.candidates_to_ix)
+        self._fingerprint = None
+        self._position_histogram = None
+        self._pairwise_counts = None
+        self._total_voters = None
+
+
+    @property
+    def position_histogram(self):
+        """
+        Weighted histogram of positions, built in one pass over voter groups and cached
+        """
+        if self._position_histogram is None:
+            self._position_histogram = position_histogram(self.ranking_matrix, self.voters)
+        return self._position_histogram
+
+
+    @property
+    def pairwise_counts(self):
+        """
+        Amounts of voters that prefer one candidate to another, built once and cached
+        """
+        if self._pairwise_counts is None:
+            self._pairwise_counts = pairwise_count_matrix(self.ranking_matrix, self.voters)
+        return self._pairwise_counts
+
+
+    @property
+    def total_voters(self):
+        """
+        Total amount of voters in all groups, computed once and cached
+        """
+        if self._total_voters is None:
+            self._total_voters = self.voters.sum()
+        return self._total_voters
+
+
+    def fingerprint(self):
+        """
+        Canonical hash of the profile: sorted deduplicated groups with their voters,
+        does not depend on the order of rankings in the input
+        """
+        if self._fingerprint is None:
+            # Sort groups lexicographically by positions of candidates
+            order = np.lexsort(self.ranking_matrix[::-1])
+            digest = hashlib.sha256()
+            digest.update(repr(self.candidates.tolist()).encode())
+            digest.update(self.ranking_matrix[:, order].astype(np.int64).tobytes())
+            digest.update(self.voters[order].astype(np.float64).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
 
 
     def _build_ranking_matrix(self, ranking, candidates_to_ix):
@@ -159,3 +223,35 @@ class RankingMatrix:
             rows, cols = np.where(ranking == candidate)
             ranking_matrix[i, :] = rows[np.argsort(cols)]
         return ranking_matrix
+
+
+def position_histogram(ranking_matrix: np.array, voters: Iterable):
+    """
+    Builds a matrix, where [i, p] corresponds to the amount of voters that put candidate i
+    in position p, from ranking_matrix ([i, j] is a position of candidate i for voter group j)
+    """
+    ranking_matrix = np.asarray(ranking_matrix).astype(int)
+    voters = np.asarray(voters)
+    n_candidates = ranking_matrix.shape[0]
+    # Bin (candidate, position) pairs weighted by voters
+    flat_ix = (np.arange(n_candidates)[:, None] * n_candidates + ranking_matrix).ravel()
+    histogram = np.bincount(flat_ix,
+                            weights = np.broadcast_to(voters, ranking_matrix.shape).ravel(),
+                            minlength = n_candidates ** 2)
+    return histogram.reshape(n_candidates, n_candidates).astype(voters.dtype)
+
+
+def pairwise_count_matrix(ranking_matrix: np.array, voters: Iterable):
+    """
+    Builds a matrix, where [i, j] corresponds to the amount of voters that prefer candidate i
+    to candidate j, diagonal holds total amount of voters
+    """
+    ranking_matrix = np.asarray(ranking_matrix)
+    voters = np.asarray(voters)
+    n_candidates = ranking_matrix.shape[0]
+    count_matrix = np.empty((n_candidates, n_candidates))
+    # Row by row keeps memory at O(candidates * voter groups)
+    for i in range(n_candidates):
+        count_matrix[i, :] = (ranking_matrix[i] < ranking_matrix) @ voters
+    np.fill_diagonal(count_matrix, voters.sum())
+    return count_matrix
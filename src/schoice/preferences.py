@@ -1,5 +1,4 @@
 from collections.abc import Iterable
-from itertools import combinations
 import numpy as np
 from .matrix import RankingMatrix
 
@@ -99,20 +98,24 @@ def is_best(rm_obj: RankingMatrix, candidate_list: Iterable = None):
     return candidate_list[winner_ids]
 
 
+def pairwise_counts(rm_obj: RankingMatrix, candidate_list: Iterable = None):
+    """
+    Constructs a matrix, where [i, j] is the amount of voters that prefer candidate i
+    to candidate j, diagonal holds total amount of voters
+
+    Works with any object that provides pairwise_counts (RankingMatrix or Tally)
+    """
+    candidate_list, indices = candidate_list_filler(rm_obj, candidate_list)
+    return candidate_list, rm_obj.pairwise_counts[np.ix_(indices, indices)]
+
+
 def pairwise_preferences(rm_obj: RankingMatrix, candidate_list: Iterable = None):
     """
     Constructs a matrix of pairwise preferences
     """
-    # Run pairwise comparisons
-    candidate_list, _ = candidate_list_filler(rm_obj, candidate_list)
-    pairwise_size = len(candidate_list)
-    pairwise_matrix = np.empty((pairwise_size, pairwise_size))
+    candidate_list, count_matrix = pairwise_counts(rm_obj, candidate_list)
+    pairwise_matrix = np.sign(count_matrix - count_matrix.T)
     np.fill_diagonal(pairwise_matrix, 1)
-    for i, j in combinations(range(pairwise_size), r = 2):
-        candidate, other = candidate_list[i], candidate_list[j]
-        pairwise_ij = is_prefered_social_num(rm_obj, candidate, other)
-        pairwise_matrix[i, j] = pairwise_ij
-        pairwise_matrix[j, i] = -pairwise_ij
     return candidate_list, pairwise_matrix
 
 
@@ -120,7 +123,20 @@ def count_votes(rm_obj: RankingMatrix, candidate_list: Iterable = None):
     """
     Function returns the number of votes that candidates get, 
     only candidates in candidate_list run
+
+    When all candidates or at most two candidates run, votes are taken from
+    position_histogram or pairwise_counts, so Tally is accepted as well
     """
+    candidate_list, indices = candidate_list_filler(rm_obj, candidate_list)
+    if len(indices) == rm_obj.n_candidates:
+        # First preferences
+        return candidate_list, rm_obj.position_histogram[indices, 0].astype(int)
+    if len(indices) <= 2:
+        # Pairwise vote, diagonal holds total amount of voters and is never the minimum
+        _, count_matrix = pairwise_counts(rm_obj, candidate_list)
+        return candidate_list, count_matrix.min(axis = 1).astype(int)
+    if not isinstance(rm_obj, RankingMatrix):
+        raise ValueError("Votes for a subset of more than two candidates need RankingMatrix")
     # Maybe there is a better solution
     # At least, it preserves the order
     candidate_list, row_ind = is_best_num(rm_obj, candidate_list)
@@ -0,0 +1,168 @@
+from collections.abc import Iterable
+import numpy as np
+from .matrix import RankingMatrix, position_histogram, pairwise_count_matrix
+from .aggr_rules import condorcet_rule, copeland_rule, smith_rule, schwartz_rule, simpson_rule, \
+    scoring_rule, plurality_rule, veto_rule, bucklin_rule, median_rank_rule
+
+
+class Tally:
+    """
+    Class that keeps sufficient statistics of a ranking profile and updates them
+    batch by batch, without storing the rankings themselves
+
+    Attributes
+    ----------
+    candidates: np.array
+        One dimensional np.array with sorted candidates
+    position_histogram: np.array
+        Two dimensional np.array, where [i, p] corresponds to the amount of voters
+        that put candidate i in position p
+    pairwise_counts: np.array
+        Two dimensional np.array, where [i, j] corresponds to the amount of voters
+        that prefer candidate i to candidate j, diagonal holds total amount of voters
+    total_voters: float
+        Total amount of voters tallied so far
+
+    Rules from aggr_rules accept Tally in place of RankingMatrix when they only need
+    position_histogram and pairwise_counts (positional rules and plurality work
+    for the full candidate list)
+    """
+    def __init__(self, candidates: Iterable):
+        """
+        Initializes empty tallies over candidates
+
+        Parameters
+        ----------
+        candidates: Iterable
+            One dimensional Iterable with candidates that can appear on ballots
+        """
+        candidates = np.array(candidates)
+        if candidates.ndim != 1:
+            raise ValueError(f"Expected candidates to be 1 dimensional, \
+                             received candidates of shape {candidates.shape}")
+        self.candidates = np.unique(candidates)
+        if self.candidates.shape[0] != candidates.shape[0]:
+            raise ValueError("Candidates should not include duplicates")
+        self.n_candidates = self.candidates.shape[0]
+        self.candidates_to_ix = {candidate: id for id, candidate in enumerate(self.candidates)}
+        self.position_histogram = np.zeros((self.n_candidates, self.n_candidates))
+        self.pairwise_counts = np.zeros((self.n_candidates, self.n_candidates))
+        self.total_voters = 0
+
+
+    @classmethod
+    def from_ranking_matrix(cls, rm_obj: RankingMatrix):
+        """
+        Builds tallies from the deduplicated groups of RankingMatrix
+        """
+        tally = cls(rm_obj.candidates)
+        tally.update_positions(rm_obj.ranking_matrix, rm_obj.voters)
+        return tally
+
+
+    def copy(self):
+        """
+        Returns an independent copy of the tallies
+        """
+        other = Tally.__new__(Tally)
+        other.candidates = self.candidates
+        other.n_candidates = self.n_candidates
+        other.candidates_to_ix = self.candidates_to_ix
+        other.position_histogram = self.position_histogram.copy()
+        other.pairwise_counts = self.pairwise_counts.copy()
+        other.total_voters = self.total_voters
+        return other
+
+
+    def positions(self, ranking: Iterable):
+        """
+        Converts ranking (rows correspond to voters, as in RankingMatrix) into a matrix,
+        where [i, j] corresponds to a position of candidate i in preferences of voter j
+        """
+        try:
+            ranking = np.array(ranking)
+        except Exception as np_read_err:
+            raise RuntimeError("Could not convert argument to np.array:",
+                               np_read_err) from np_read_err
+        if ranking.ndim == 1:
+            ranking = np.expand_dims(ranking, axis = 0)
+        if ranking.ndim != 2 or ranking.shape[1] != self.n_candidates:
+            raise ValueError(f"Expected ranking of shape (n, {self.n_candidates}), \
+                             received ranking of shape {ranking.shape}")
+        # Candidates are sorted, so searchsorted maps names to indices
+        ranked_ix = np.searchsorted(self.candidates, ranking)
+        ranked_ix[ranked_ix == self.n_candidates] = 0
+        if not (self.candidates[ranked_ix] == ranking).all():
+            raise ValueError(f"Ranking includes unknown candidates: \
+                             {np.setdiff1d(ranking, self.candidates)}")
+        if not (np.sort(ranked_ix, axis = 1) == np.arange(self.n_candidates)).all():
+            raise ValueError("Each ranking should rank every candidate exactly once")
+        positions = np.empty_like(ranked_ix)
+        np.put_along_axis(positions, ranked_ix,
+                          np.broadcast_to(np.arange(self.n_candidates), ranked_ix.shape),
+                          axis = 1)
+        return positions.T
+
+
+    def update(self, ranking: Iterable, voters: Iterable):
+        """
+        Adds a batch of rankings to the tallies
+
+        Parameters
+        ----------
+        ranking: Iterable
+            Contains new rankings, can be 2 dimensional, rows correspond to voters
+        voters: Iterable
+            Contains quantities of voters corresponding to new rankings
+        """
+        self.update_positions(self.positions(ranking), voters)
+
+
+    def update_positions(self, ranking_matrix: np.array, voters: Iterable):
+        """
+        Adds a batch to the tallies, batch is given as positions of candidates
+        ([i, j] is a position of candidate i for voter group j), costs O(m^2) per group
+        """
+        ranking_matrix = np.asarray(ranking_matrix).astype(int)
+        voters = np.asarray(voters)
+        if ranking_matrix.shape[1] != voters.shape[0]:
+            raise ValueError(f"Expected voters and rankings dimensions to coincide, but received: \
+                             ranking: {ranking_matrix.shape[1]}, \n \
+                             voters: {voters.shape[0]})")
+        self.position_histogram += position_histogram(ranking_matrix, voters)
+        self.pairwise_counts += pairwise_count_matrix(ranking_matrix, voters)
+        self.total_voters += voters.sum()
+
+
+    def merge(self, other):
+        """
+        Adds tallies of other (over the same candidates) to these tallies, costs O(m^2)
+        """
+        if not np.array_equal(self.candidates, other.candidates):
+            raise ValueError("Merged tallies should have the same candidates")
+        self.position_histogram += other.position_histogram
+        self.pairwise_counts += other.pairwise_counts
+        self.total_voters += other.total_voters
+
+
+    @property
+    def first_preferences(self):
+        """
+        Amount of voters that rank each candidate first
+        """
+        return self.position_histogram[:, 0]
+
+
+# Rules from aggr_rules run on Tally through position_histogram and pairwise_counts
+TALLY_RULES = {
+    "condorcet": condorcet_rule,
+    "copeland": copeland_rule,
+    "smith": smith_rule,
+    "schwartz": schwartz_rule,
+    "simpson": simpson_rule,
+    "scoring": scoring_rule,
+    "plurality": plurality_rule,
+    "veto": veto_rule,
+    "bucklin": bucklin_rule,
+    "median_rank": median_rank_rule,
+}
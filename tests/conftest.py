@@ -0,0 +1,54 @@
+# pylint: skip-file
+import pytest
+from src.schoice import *
+
+
+@pytest.fixture()
+def profile1():
+    voters = [6, 3, 4, 4]
+    ranking = [
+        ["a", "b", "c"],
+        ["c", "a", "b"],
+        ["b", "a", "c"],
+        ["b", "c", "a"]
+    ]
+    return ranking, voters
+
+
+@pytest.fixture()
+def profile2():
+    voters = [1, 4, 1, 3]
+    ranking = [
+        ["a", "b", "c", "d", "e"],
+        ["c", "d", "b", "e", "a"],
+        ["e", "a", "d", "b", "c"],
+        ["e", "a", "b", "d", "c"]
+    ]
+    return ranking, voters
+
+
+@pytest.fixture()
+def profile3():
+    voters = [5, 3, 5, 4]
+    ranking = [
+        ["a", "d", "c", "b"],
+        ["a", "d", "b", "c"],
+        ["b", "c", "d", "a"],
+        ["c", "d", "b", "a"]
+    ]
+    return ranking, voters
+
+
+@pytest.fixture()
+def matrix1(profile1):
+    return RankingMatrix(*profile1)
+
+
+@pytest.fixture()
+def matrix2(profile2):
+    return RankingMatrix(*profile2)
+
+
+@pytest.fixture()
+def matrix3(profile3):
+    return RankingMatrix(*profile3)
@@ -184,4 +184,104 @@ def test3(matrix3):
     assert runoff_result[0] == 2
     assert runoff_result[1].item() == "b"
     assert np.array_equal(runoff_result[2], np.array(["a", "b"]))
-    assert np.array_equal(runoff_result[3], np.array([8, 9]))
\ No newline at end of file
+    assert np.array_equal(runoff_result[3], np.array([8, 9]))
+
+def test_majority_sets(matrix1, matrix2, matrix3):
+
+    ## Cycle through all the candidates
+    smith_result = smith_rule(matrix2)
+    assert np.array_equal(smith_result[0], np.array(["a", "b", "c", "d", "e"]))
+    assert np.array_equal(smith_result[2], condorcet_rule(matrix2)[2])
+    schwartz_result = schwartz_rule(matrix2)
+    assert np.array_equal(schwartz_result[0], np.array(["a", "b", "c", "d", "e"]))
+
+    ## Condorcet winner
+    assert smith_rule(matrix3)[0].item() == "c"
+    assert schwartz_rule(matrix3)[0].item() == "c"
+    assert np.array_equal(smith_rule(matrix3, ["a", "b", "d"])[0], np.array(["d"]))
+
+    ## Edge list
+    edges, margins = majority_edges(matrix1)
+    assert np.array_equal(edges, np.array([["a", "b"], ["a", "c"], ["b", "c"]]))
+    assert np.array_equal(margins, np.array([1, 3, 11]))
+
+
+def test_majority_graph():
+    from src.schoice.majority_graph import majority_graph, dominant_components, \
+        strongly_connected_components
+    # a ties b, b beats c, c beats a
+    preferences = np.array([
+        [1, 0, -1],
+        [0, 1, 1],
+        [1, -1, 1]
+    ])
+    assert np.array_equal(dominant_components(majority_graph(preferences, weak = True)),
+                          [True, True, True])
+    assert np.array_equal(dominant_components(majority_graph(preferences)),
+                          [False, True, False])
+    # All ties, no strict majority edges
+    preferences = np.zeros((4, 4))
+    component, n_components = strongly_connected_components(majority_graph(preferences))
+    assert n_components == 4
+    assert np.array_equal(dominant_components(majority_graph(preferences)), [True] * 4)
+    # Transitive tournament on many candidates
+    order = np.arange(300)
+    preferences = np.sign(order[None, :] - order[:, None])
+    np.fill_diagonal(preferences, 1)
+    assert np.array_equal(np.flatnonzero(dominant_components(majority_graph(preferences))), [0])
+
+
+def test_positional(matrix1, matrix3):
+
+    ## Histogram
+    assert np.array_equal(matrix1.position_histogram, np.array([
+        [6, 7, 4],
+        [8, 6, 3],
+        [3, 4, 10]
+    ]))
+    assert matrix1.total_voters == 17
+    # Histogram and total are rebuilt after add
+    matrix1.add(["c", "b", "a"], [1])
+    assert np.array_equal(matrix1.position_histogram[:, 0], np.array([6, 8, 4]))
+    assert matrix1.total_voters == 18
+
+    ## k-approval
+    approval_result = k_approval_rule(matrix3, 2)
+    assert approval_result[0].item() == "d"
+    assert np.array_equal(approval_result[1], np.array(["a", "b", "c", "d"]))
+    assert np.array_equal(approval_result[2], np.array([8, 5, 9, 12]))
+    # Plurality is 1-approval
+    assert np.array_equal(k_approval_rule(matrix3, 1)[2], plurality_rule(matrix3)[3])
+
+    ## Veto
+    veto_result = veto_rule(matrix3)
+    assert veto_result[0].item() == "d"
+    assert np.array_equal(veto_result[2], np.array([9, 5, 3, 0]))
+
+    ## Bucklin
+    bucklin_result = bucklin_rule(matrix3)
+    assert bucklin_result[0] == 2
+    assert bucklin_result[1].item() == "d"
+    assert np.array_equal(bucklin_result[3], np.array([8, 5, 9, 12]))
+    # Candidates are re-ranked among candidate_list
+    bucklin_result = bucklin_rule(matrix3, ["b", "a"])
+    assert bucklin_result[0] == 1
+    assert bucklin_result[1].item() == "b"
+    assert np.array_equal(bucklin_result[3], np.array([9, 8]))
+
+    ## Median rank
+    median_result = median_rank_rule(matrix3)
+    assert np.array_equal(median_result[0], np.array(["c", "d"]))
+    assert np.array_equal(median_result[2], np.array([3, 2, 1, 1]))
+
+
+def test_scoring_candidate_order(matrix1):
+    # Scores follow candidate_list order
+    borda_result = scoring_rule(matrix1, ["c", "a", "b"])
+    assert borda_result[0].item() == "b"
+    assert np.array_equal(borda_result[2], np.array([10, 19, 22]))
+
+    # Candidates are re-ranked among candidate_list
+    borda_result = scoring_rule(matrix1, ["c", "a"])
+    assert borda_result[0].item() == "a"
+    assert np.array_equal(borda_result[2], np.array([7, 10]))
@@ -0,0 +1,125 @@
+# pylint: skip-file
+import functools
+import io
+import pickle
+import numpy as np
+from src.schoice import *
+from src.schoice.cache import ResultCache
+
+
+def test_fingerprint(profile1):
+    ranking, voters = profile1
+    matrix = RankingMatrix(ranking, voters)
+    # Order of rankings and split duplicates do not matter
+    shuffled = RankingMatrix(ranking[::-1] + [ranking[0]], voters[::-1] + [0])
+    split = RankingMatrix(ranking + [ranking[0]], [3] + voters[1:] + [3])
+    assert matrix.fingerprint() == shuffled.fingerprint() == split.fingerprint()
+    assert matrix.fingerprint() != RankingMatrix(ranking, [6, 3, 4, 5]).fingerprint()
+    # Fingerprint is updated by add
+    before = matrix.fingerprint()
+    matrix.add(["c", "b", "a"], [1])
+    assert matrix.fingerprint() != before
+
+
+def test_cache(profile1):
+    ranking, voters = profile1
+    cache = ResultCache(maxsize = 2)
+    calls = []
+
+    def counted_scoring(rm_obj, candidate_list = None, weights = None):
+        calls.append(candidate_list)
+        return scoring_rule(rm_obj, candidate_list, weights)
+
+    cached_scoring = cache.wrap(counted_scoring)
+    result = cached_scoring(RankingMatrix(ranking, voters))
+    # Same profile in another order is a hit
+    repeated = cached_scoring(RankingMatrix(ranking[::-1], voters[::-1]))
+    assert len(calls) == 1 and cache.hits == 1
+    for part, repeated_part in zip(result, repeated):
+        assert np.array_equal(part, repeated_part)
+    # Returned values are copies
+    repeated[2][0] = -1
+    assert cached_scoring(RankingMatrix(ranking, voters))[2][0] == 19
+
+    # Parameters and candidate subsets are parts of the key
+    cached_scoring(RankingMatrix(ranking, voters), weights = np.array([0, 0, 1]))
+    cached_scoring(RankingMatrix(ranking, voters), weights = [0, 0, 1])
+    assert len(calls) == 2
+    matrix = RankingMatrix(ranking, voters)
+    assert cache.key(condorcet_rule, matrix, ["a", "a", "b"]) == \
+        cache.key(condorcet_rule, matrix, ["a", "b"]) != cache.key(condorcet_rule, matrix)
+    cached_scoring(matrix, weights = [1, 1, 1])
+    assert len(calls) == 3
+    # Least recently used result (Borda) was evicted
+    cached_scoring(RankingMatrix(ranking, voters))
+    assert len(calls) == 4
+
+
+def test_disk_cache(tmp_path, matrix1):
+    first = ResultCache(maxsize = 2, path = tmp_path)
+    first(condorcet_rule, matrix1)
+    first(plurality_rule, matrix1, runoff = True)
+    first(copeland_rule, matrix1)
+    assert len(list(tmp_path.iterdir())) == 2
+    # New cache reads results from disk
+    second = ResultCache(path = tmp_path)
+    tour, winners, _, _ = second(plurality_rule, matrix1, runoff = True)
+    assert second.hits == 1 and second.misses == 0
+    assert tour == 2 and winners.item() == "a"
+    second.clear()
+    assert len(list(tmp_path.iterdir())) == 0
+
+    # Truncated file (e.g. from a crashed writer) is a miss and is replaced
+    first = ResultCache(path = tmp_path)
+    first(condorcet_rule, matrix1)
+    (file_path,) = tmp_path.iterdir()
+    file_path.write_bytes(file_path.read_bytes()[:10])
+    second = ResultCache(path = tmp_path)
+    second(condorcet_rule, matrix1)
+    assert second.misses == 1
+    assert ResultCache(path = tmp_path)(condorcet_rule, matrix1)[0].item() == "a"
+    # File evicted by another process is a miss
+    for file_path in tmp_path.iterdir():
+        file_path.unlink()
+    assert ResultCache(path = tmp_path)(condorcet_rule, matrix1)[0].item() == "a"
+    # Lambdas and local functions are never written to disk
+    second(lambda rm_obj: rm_obj.total_voters, matrix1)
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_disk_cache_races(tmp_path, matrix1, monkeypatch):
+    ResultCache(path = tmp_path)(condorcet_rule, matrix1)
+    load = pickle.load
+
+    def evicted_load(cache_file):
+        # Another process removes the file while it is read
+        for file_path in tmp_path.iterdir():
+            file_path.unlink()
+        load(io.BytesIO(b""))
+
+    monkeypatch.setattr(pickle, "load", evicted_load)
+    cache = ResultCache(path = tmp_path)
+    assert cache(condorcet_rule, matrix1)[0].item() == "a"
+    assert cache.misses == 1
+
+
+def test_cache_rules(matrix1):
+    cache = ResultCache()
+    # Lambdas with the same qualified name are different rules
+    first, second = [lambda rm_obj, shift = shift: rm_obj.total_voters + shift for shift in (0, 1)]
+    assert cache(first, matrix1) == 17 and cache(second, matrix1) == 18
+    # Partial is keyed by the function and all its arguments
+    borda = functools.partial(scoring_rule, weights = [0, 1, 2])
+    veto = functools.partial(scoring_rule, weights = [0, 1, 1])
+    assert cache.key(borda, matrix1) == cache.key(scoring_rule, matrix1, None, [0, 1, 2])
+    assert cache(borda, matrix1)[2].tolist() == [19, 22, 10]
+    assert cache(veto, matrix1)[2].tolist() == [13, 14, 7]
+    # Positional arguments are bound to parameters of the rule
+    cached_stv = cache.wrap(stv_rule)
+    assert np.array_equal(cached_stv(matrix1, 2)[0], stv_rule(matrix1, 2)[0])
+    assert cache.key(stv_rule, matrix1, 2) == cache.key(stv_rule, matrix1, k = 2) != \
+        cache.key(stv_rule, matrix1, 1)
+    assert cache.wrap(k_approval_rule)(matrix1, 2)[2].tolist() == \
+        k_approval_rule(matrix1, k = 2)[2].tolist()
+    assert cache.wrap(scoring_rule)(matrix1, None, [0, 1, 2])[2].tolist() == [19, 22, 10]
+    assert cache.hits == 1
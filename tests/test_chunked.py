@@ -0,0 +1,39 @@
+# pylint: skip-file
+import pytest
+import numpy as np
+from src.schoice import *
+from src.schoice.tally import Tally
+from src.schoice.chunked import write_profile, open_profile, iter_profile_chunks, tally_profile
+
+
+def test_write_open(tmp_path, profile3, matrix3):
+    ranking, voters = profile3
+    n_groups = write_profile(tmp_path, ["a", "b", "c", "d"],
+                             [(ranking[:3], voters[:3]), (ranking[3], voters[3:])])
+    assert n_groups == 4
+    candidates, positions, disk_voters = open_profile(tmp_path)
+    assert np.array_equal(candidates, ["a", "b", "c", "d"])
+    assert np.array_equal(disk_voters, voters)
+    assert np.array_equal(positions.T, matrix3.ranking_matrix)
+    chunks = list(iter_profile_chunks(tmp_path, chunk_size = 3))
+    assert [chunk[1].shape[0] for chunk in chunks] == [3, 1]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_tally_profile(tmp_path, profile3, matrix3, chunk_size):
+    ranking, voters = profile3
+    write_profile(tmp_path, ["a", "b", "c", "d"], [(ranking, voters)])
+    tally = tally_profile(tmp_path, chunk_size = chunk_size)
+    expected = Tally.from_ranking_matrix(matrix3)
+    assert np.array_equal(tally.position_histogram, expected.position_histogram)
+    assert np.array_equal(tally.pairwise_counts, expected.pairwise_counts)
+    assert condorcet_rule(tally)[0].item() == "c"
+    assert np.array_equal(scoring_rule(tally)[2], [24, 22, 27, 29])
+
+
+def test_empty_profile(tmp_path):
+    write_profile(tmp_path, ["a", "b"], [])
+    tally = tally_profile(tmp_path)
+    assert tally.total_voters == 0
+    with pytest.raises(ValueError):
+        list(iter_profile_chunks(tmp_path, chunk_size = 0))
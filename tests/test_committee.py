@@ -0,0 +1,51 @@
+# pylint: skip-file
+import pytest
+import numpy as np
+from src.schoice import *
+from src.schoice.committee import stv_rule, chamberlin_courant_rule, monroe_rule
+
+
+def test_stv(matrix1):
+    # b exceeds quota 6, surplus goes to a and c
+    stv_result = stv_rule(matrix1, 2)
+    assert np.array_equal(stv_result[0], np.array(["b", "a"]))
+    assert np.array_equal(stv_result[1], np.array(["a", "b", "c"]))
+    assert np.array_equal(stv_result[2], np.array([6, 6, 5]))
+
+    # Single winner STV is instant runoff
+    stv_result = stv_rule(matrix1, 1)
+    assert stv_result[0].item() == "a"
+    assert np.array_equal(stv_result[2], np.array([9, 8, 0]))
+
+    # Whole candidate list is elected
+    assert np.array_equal(stv_rule(matrix1, 3)[0], np.array(["b", "a", "c"]))
+
+
+def test_chamberlin_courant(matrix1):
+    cc_result = chamberlin_courant_rule(matrix1, 2)
+    assert np.array_equal(cc_result[0], np.array(["b", "a"]))
+    assert np.array_equal(cc_result[2], np.array([22, 9]))
+
+    # Committee of one is a scoring rule winner
+    assert cc_result[0][0] == scoring_rule(matrix1)[0].item()
+
+    # Candidates are re-ranked among candidate_list
+    cc_result = chamberlin_courant_rule(matrix1, 1, ["a", "c"])
+    assert cc_result[0].item() == "a"
+    assert np.array_equal(cc_result[2], np.array([10]))
+
+
+def test_monroe(matrix1):
+    # b represents 8.5 voters: groups 3 and 4, half of group 1
+    monroe_result = monroe_rule(matrix1, 2)
+    assert np.array_equal(monroe_result[0], np.array(["b", "a"]))
+    assert np.array_equal(monroe_result[2], np.array([16.5, 14]))
+
+
+def test_committee_errors(matrix1):
+    with pytest.raises(ValueError) as verr:
+        stv_rule(matrix1, 4)
+    assert "Committee size" in str(verr.value)
+    with pytest.raises(ValueError) as verr:
+        chamberlin_courant_rule(matrix1, 2, weights = [0, 1])
+    assert "Shape of weights" in str(verr.value)
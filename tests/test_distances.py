@@ -0,0 +1,76 @@
+# pylint: skip-file
+from itertools import combinations
+import pytest
+import numpy as np
+from src.schoice import *
+from src.schoice.distances import kendall_tau_matrix, footrule_matrix, k_medoids
+
+
+@pytest.fixture()
+def polarized():
+    # Two camps around opposite rankings
+    voters = [10, 2, 3, 9, 1, 2]
+    ranking = [
+        ["a", "b", "c", "d", "e", "f"],
+        ["b", "a", "c", "d", "e", "f"],
+        ["a", "b", "c", "d", "f", "e"],
+        ["f", "e", "d", "c", "b", "a"],
+        ["e", "f", "d", "c", "b", "a"],
+        ["f", "e", "d", "c", "a", "b"]
+    ]
+    return RankingMatrix(ranking, voters)
+
+
+def test_distances(matrix2):
+    positions = matrix2.ranking_matrix.T
+    kendall = kendall_tau_matrix(matrix2)
+    footrule = footrule_matrix(matrix2)
+    for i, j in combinations(range(positions.shape[0]), r = 2):
+        discordant = sum(np.sign(positions[i, a] - positions[i, b]) !=
+                         np.sign(positions[j, a] - positions[j, b])
+                         for a, b in combinations(range(positions.shape[1]), r = 2))
+        assert kendall[i, j] == kendall[j, i] == discordant
+        assert footrule[i, j] == footrule[j, i] == np.abs(positions[i] - positions[j]).sum()
+    assert np.array_equal(np.diag(kendall), np.zeros(4))
+    # Blocks should not change the result
+    assert np.array_equal(kendall_tau_matrix(matrix2, max_block = 1), kendall)
+    assert np.array_equal(footrule_matrix(matrix2, max_block = 1), footrule)
+
+
+def test_k_medoids(polarized):
+    # Each of the four remaining groups is one swap away from its medoid
+    for metric, swap in [("kendall", 1), ("footrule", 2)]:
+        medoids, labels, cost = k_medoids(polarized, 2, metric = metric, seed = 0, max_block = 10)
+        # Heaviest groups are the centers of their camps
+        assert sorted(medoids.tolist()) == [0, 3]
+        assert labels[0] == labels[1] == labels[2] != labels[3] == labels[4] == labels[5]
+        assert cost == (2 + 3 + 1 + 2) * swap
+    with pytest.raises(ValueError):
+        k_medoids(polarized, 7)
+    with pytest.raises(ValueError):
+        k_medoids(polarized, 2, metric = "unknown")
+
+    # Groups without voters are drawn once weighted groups are taken
+    with_empty = RankingMatrix([["a", "b"], ["b", "a"]], [5, 0])
+    for seed in range(5):
+        medoids, labels, cost = k_medoids(with_empty, 2, seed = seed)
+        assert sorted(medoids.tolist()) == [0, 1] and cost == 0
+    assert k_medoids(RankingMatrix([["a", "b"], ["b", "a"]], [0, 0]), 1, seed = 0)[2] == 0
+
+
+def test_block_bound(monkeypatch, polarized):
+    from src.schoice import distances
+    sizes = []
+    distance_block = distances._distance_block
+
+    def recording_block(positions, orders, rows, cols, metric):
+        sizes.append(len(rows) * len(cols) * positions.shape[1])
+        return distance_block(positions, orders, rows, cols, metric)
+
+    monkeypatch.setattr(distances, "_distance_block", recording_block)
+    expected = kendall_tau_matrix(polarized)
+    sizes.clear()
+    # 12 positions fit two pairs of groups with 6 candidates
+    assert np.array_equal(kendall_tau_matrix(polarized, max_block = 12), expected)
+    k_medoids(polarized, 2, seed = 0, max_block = 12)
+    assert max(sizes) == 12
@@ -0,0 +1,174 @@
+# pylint: skip-file
+import asyncio
+import pytest
+import numpy as np
+from src.schoice import *
+from src.schoice.tally import Tally
+from src.schoice.live import LiveTally
+
+
+def test_tally_matches_rules(profile2, matrix2):
+    ranking, voters = profile2
+    tally = Tally(["a", "b", "c", "d", "e"])
+    # Split in batches, rules should not depend on it
+    tally.update(ranking[:2], voters[:2])
+    tally.update(ranking[2], voters[2:3])
+    tally.update(ranking[3:], voters[3:])
+    assert tally.total_voters == 9
+    assert np.array_equal(tally.first_preferences, [1, 0, 4, 0, 4])
+    # Rules from aggr_rules run on tallies alone
+    for rule, params in [(condorcet_rule, {}), (copeland_rule, {}), (simpson_rule, {}),
+                         (scoring_rule, {}), (scoring_rule, {"weights": [0, 0, 1, 2, 4]}),
+                         (plurality_rule, {}), (plurality_rule, {"runoff": True}),
+                         (smith_rule, {}), (schwartz_rule, {}), (k_approval_rule, {"k": 2}),
+                         (veto_rule, {}), (bucklin_rule, {}), (median_rank_rule, {}),
+                         (condorcet_rule, {"candidate_list": ["b", "d", "e"]})]:
+        for tally_out, matrix_out in zip(rule(tally, **params), rule(matrix2, **params)):
+            assert np.array_equal(tally_out, matrix_out)
+    assert np.array_equal(Tally.from_ranking_matrix(matrix2).pairwise_counts,
+                          tally.pairwise_counts)
+    # Merged tallies of parts equal tallies of the whole
+    merged = Tally(["a", "b", "c", "d", "e"])
+    merged.update(ranking[:2], voters[:2])
+    other = Tally(["a", "b", "c", "d", "e"])
+    other.update(ranking[2:], voters[2:])
+    merged.merge(other)
+    assert np.array_equal(merged.pairwise_counts, tally.pairwise_counts)
+    assert np.array_equal(merged.position_histogram, tally.position_histogram)
+    assert merged.total_voters == 9
+    with pytest.raises(ValueError):
+        merged.merge(Tally(["a", "b"]))
+    # Positions among a subset are not recoverable from tallies
+    with pytest.raises(ValueError):
+        scoring_rule(tally, ["a", "b"])
+    with pytest.raises(ValueError):
+        count_votes(tally, ["a", "b", "c"])
+
+
+def test_tally_errors():
+    tally = Tally(["a", "b", "c"])
+    with pytest.raises(ValueError) as verr:
+        tally.update([["a", "b", "z"]], [1])
+    assert "unknown candidates" in str(verr.value)
+    with pytest.raises(ValueError) as verr:
+        tally.update([["a", "b", "b"]], [1])
+    assert "exactly once" in str(verr.value)
+    with pytest.raises(ValueError) as verr:
+        tally.update([["a", "b", "c"]], [1, 2])
+    assert "dimensions to coincide" in str(verr.value)
+
+
+def test_live_tally(profile2, matrix2):
+    ranking, voters = profile2
+    rules = {"plurality": plurality_rule, "condorcet": condorcet_rule,
+             "voters": lambda tally: tally.total_voters}
+
+    async def main():
+        live = LiveTally(["a", "b", "c", "d", "e"], rules = rules, refresh_interval = 0.01)
+        await live.start()
+        updates = live.updates()
+        published = []
+        # Every batch is published before the next one is submitted
+        for row, count in zip(ranking, voters):
+            await live.submit([row], [count])
+            results = await asyncio.wait_for(updates.__anext__(), timeout = 5)
+            published.append((live.version, results["voters"]))
+        await live.stop()
+        # Consumer finishes after stop
+        remaining = [results async for results in updates]
+        return live, published, remaining
+
+    live, published, remaining = asyncio.run(main())
+    assert published == [(1, 1), (2, 5), (3, 6), (4, 9)]
+    assert remaining == []
+    assert live.version == 4
+    assert np.array_equal(live.results["plurality"][1], ["c", "e"])
+    assert np.array_equal(live.results["condorcet"][2], condorcet_rule(matrix2)[2])
+
+
+def test_live_tally_refresh_rate(profile2):
+    ranking, voters = profile2
+
+    async def main():
+        live = LiveTally(["a", "b", "c", "d", "e"], rules = ["scoring"], refresh_interval = 60)
+        async with live:
+            updates = live.updates()
+            for _ in range(10):
+                await asyncio.gather(*[live.submit([row], [count])
+                                       for row, count in zip(ranking, voters)])
+                await asyncio.sleep(0.01)
+            versions_running = live.version
+        # Final results after stop are yielded, then generator ends
+        delivered = [results async for results in updates]
+        return live, versions_running, delivered
+
+    live, versions_running, delivered = asyncio.run(main())
+    # One publication per refresh interval while running, then the final one
+    assert versions_running == 1
+    assert live.version == 2
+    assert len(delivered) == 1
+    assert live.tally.total_voters == 90
+    assert live.results["scoring"][0].item() == "e"
+
+
+def test_live_tally_rule_error(profile2):
+    ranking, voters = profile2
+
+    def failing_rule(tally):
+        raise ZeroDivisionError("rule failed")
+
+    async def main():
+        live = LiveTally(["a", "b", "c", "d", "e"], refresh_interval = 0.01,
+                         rules = {"failing": failing_rule, "plurality": plurality_rule})
+        async with live:
+            updates = live.updates()
+            await live.submit(ranking[:2], voters[:2])
+            first = await asyncio.wait_for(updates.__anext__(), timeout = 5)
+            await live.submit(ranking[2:], voters[2:])
+            second = await asyncio.wait_for(updates.__anext__(), timeout = 5)
+        return first, second
+
+    first, second = asyncio.run(main())
+    # Failing rule does not stop publications of other rules
+    assert isinstance(first["failing"], ZeroDivisionError)
+    assert np.array_equal(first["plurality"][3], [1, 0, 4, 0, 0])
+    assert isinstance(second["failing"], ZeroDivisionError)
+    assert np.array_equal(second["plurality"][3], [1, 0, 4, 0, 4])
+
+
+def test_live_tally_bad_batch():
+    async def main():
+        live = LiveTally(["a", "b", "c"], refresh_interval = 0.01)
+        await live.start()
+        # Batch that fails in ingestion does not stop later batches
+        await live._queue.put((live.tally.positions([["a", "b", "c"]]), np.array(["x"])))
+        await live.submit([["c", "b", "a"]], [2])
+        with pytest.warns(UserWarning, match = "Failed to tally batch"):
+            await asyncio.wait_for(live.stop(), timeout = 5)
+        return live
+
+    live = asyncio.run(main())
+    assert live.tally.total_voters == 2
+    assert live.results["plurality"][1].item() == "c"
+
+
+def test_live_tally_errors():
+    async def main():
+        live = LiveTally(["a", "b", "c"])
+        with pytest.raises(RuntimeError):
+            await live.submit([["a", "b", "c"]], [1])
+        with pytest.raises(RuntimeError):
+            live.updates()
+        async with live:
+            with pytest.raises(ValueError):
+                await live.submit([["a", "b", "z"]], [1])
+            with pytest.raises(ValueError):
+                await live.submit([["a", "b", "c"]], ["x"])
+        with pytest.raises(RuntimeError):
+            live.updates()
+        return live
+
+    live = asyncio.run(main())
+    assert live.version == 0
+    with pytest.raises(ValueError):
+        LiveTally(["a", "b"], rules = ["unknown"])